@@ -14,36 +14,50 @@
 #     - if multiple candidates -> press 1..9 to insert
 # ======================================================================
 
+import io
 import os
 import re
 import sys
 import uuid
+import time
+import atexit
 import shutil
+import hashlib
+import functools
+import threading
 import configparser
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
 import pymssql
 import pymupdf as fitz
-from PyPDF2 import PdfReader, PdfWriter
 from PIL import Image, ImageTk
 
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 
-# Deskew optional
+# OpenCV optional (OCR preprocessing)
 try:
     import cv2
     import numpy as np
 except:
     cv2 = None
 
-# OCR optional
+# OCR optional; 4 OpenMP threads per Tesseract run (must be set before it loads)
+os.environ.setdefault("OMP_THREAD_LIMIT", "4")
 try:
     import pytesseract
 except:
     pytesseract = None
 
+# in-process Tesseract optional (preferred over spawning tesseract.exe)
+try:
+    from tesserocr import PyTessBaseAPI, PSM, OEM, RIL, iterate_level
+except:
+    PyTessBaseAPI = None
+
 
 WINSPED_SQL = r"""
 USE winsped;
@@ -133,9 +147,63 @@ Hinweis
 
 # ========================= OCR CONFIG (Windows) =========================
 TESSERACT_EXE = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
+TESSDATA_DIR = r"C:\Program Files\Tesseract-OCR\tessdata"
 if pytesseract is not None and TESSERACT_EXE.strip():
     pytesseract.pytesseract.tesseract_cmd = TESSERACT_EXE
 
+# one engine per use, one caller at a time each: a whole-page pass never
+# holds the engine a selection needs
+_tess_apis = {}
+_tess_api_failed = False
+_tess_locks = {"selection": threading.Lock(), "page": threading.Lock()}
+
+# OCR runs off the Tk thread; several selections may overlap
+_ocr_pool = ThreadPoolExecutor(max_workers=max(1, (os.cpu_count() or 4) // 4))
+_ocr_seq = 0  # only the latest selection's result is applied
+
+# whole-page OCR done in the background once a page stays on screen; own
+# worker, so selections never queue behind it
+# (path, page_index, rotation) -> (OCR image size, [(word, conf, box)])
+_page_ocr_pool = ThreadPoolExecutor(max_workers=1)
+_page_ocr_cache = OrderedDict()
+_page_ocr_pending = set()
+PAGE_OCR_CACHE_SIZE = 32
+PAGE_OCR_DELAY_MS = 800
+
+# selection crops: (blake2b of the pixels, size, min_len, AUF length) -> candidates;
+# re-dragging the same box skips Tesseract. Filled from _ocr_pool, hence the lock
+_crop_ocr_cache = OrderedDict()
+_crop_ocr_lock = threading.Lock()
+CROP_OCR_CACHE_SIZE = 32
+
+
+def get_tess_api(engine="selection"):
+    # one engine per kind for the whole session; None -> use pytesseract
+    # call with _tess_locks[engine] held
+    global _tess_api_failed
+    api = _tess_apis.get(engine)
+    if api is None and not _tess_api_failed and PyTessBaseAPI is not None:
+        try:
+            api = PyTessBaseAPI(path=TESSDATA_DIR, psm=PSM.SINGLE_BLOCK, oem=OEM.LSTM_ONLY)
+            api.SetVariable("tessedit_char_whitelist", "0123456789")
+            _tess_apis[engine] = api
+        except Exception as e:
+            safe_print("tesserocr init failed, using pytesseract:", e)
+            _tess_api_failed = True
+    return api
+
+
+atexit.register(lambda: [api.End() for api in _tess_apis.values()])
+
+
+# ========================= MUPDF STORE =================================
+# the store limit is fixed when MuPDF creates its context and this PyMuPDF
+# reports no store size, so the cache is halved every STORE_SHRINK_EVERY renders
+# (and emptied in close_current_doc)
+STORE_SHRINK_EVERY = 16
+_renders_since_shrink = 0  # only touched under _fitz_lock
+fitz.TOOLS.mupdf_display_errors(False)
+
 
 # ========================= APPDATA CONFIG ==============================
 
@@ -147,13 +215,23 @@ CONFIG_FILE = os.path.join(APPDATA_DIR, "config.ini")
 # ============================ CONSTANTS ================================
 
 DOC_TYPES = ["Eingangsbelege", "Abliefernachweis", "Lademittel"]
+PREVIEW_MAX_W, PREVIEW_MAX_H = 1100, 1400
+PDF_OCR_ZOOM = 1.5  # PDF raster scale for OCR crops (preview renders smaller)
+PDF_JPEG_QUALITY = 85  # PNG scans are embedded as JPEG on save
 DEFAULT_SOURCE = r"C:\Users\Public\Documents\ScanDoc\test"
 
+SOURCE_EXTS = frozenset({"pdf", "jpg", "jpeg", "png"})
+
+_AUFNR_RE = re.compile(r"^(\d{8,9})")
+_DIGITS_RE = re.compile(r"\d+")
+
 
 # ========================= GLOBAL VARIABLES ============================
 
 files = []
+_file_aufnrs = []  # AUFNR from each file name, parallel to files
 current_index = 0
+_source_scan = None  # (src, dir mtime, sorted paths) of the last Load
 current_file_path = None
 
 current_is_pdf = False
@@ -163,13 +241,48 @@ current_rotation = 0
 
 tk_img_preview = None
 current_full_img = None
-current_preview_scale = 1.0
 
+# preview rendering: one worker, MuPDF calls serialized by _fitz_lock
+_render_pool = ThreadPoolExecutor(max_workers=1)
+_fitz_lock = threading.Lock()
+# (path, page_index, rotation) -> (full_img or None, tk_img)
+_page_cache = OrderedDict()
+PAGE_CACHE_SIZE = 8
+PREFETCH_DELAY_MS = 200
+_render_pending = {}  # key -> future submitted to _render_pool, not back yet
+_render_key = None   # page the user wants to see
+_shown_key = None    # page currently painted on the canvas
+
+# first-page thumbnails of the whole batch, shown zoomed while the real page renders;
+# own worker, held at _page_idle while a requested page is still rendering, since
+# both rasterize under _fitz_lock
+_thumb_pool = ThreadPoolExecutor(max_workers=1)
+_page_idle = threading.Event()  # set: _render_key shown (or failed/none)
+_page_idle.set()
+_thumb_cache = OrderedDict()  # path -> (tk thumbnail, integer zoom to preview size)
+_thumb_queued = set()  # paths submitted in this Load (done or not), evicted ones leave
+_thumb_gen = 0     # bumped per Load, older thumbnail jobs are skipped
+THUMB_CACHE_SIZE = 128  # ~385 KB RGBA photo each -> < 50 MB
+THUMB_AHEAD = 32        # files after the current one that get a thumbnail queued
+_thumb_shown = None
+THUMB_SHRINK = 4   # thumbnail = preview box / THUMB_SHRINK
+
+# PDF shown in the preview stays open while paging through it; opened and closed
+# on _render_pool, the Tk thread only sets _doc_want and never waits on _fitz_lock
+_current_doc = None
+_current_doc_path = None
+_doc_want = None     # path whose document should be open, None -> none
+_doc_future = None   # pending _sync_current_doc job
+
+# canvas items created once with canvas_preview, afterwards only moved/hidden
+page_img_id = None
 sel_rect_id = None
+ocr_rect_id = None
+ocr_text_id = None
 sel_start = None
+_pending_motion = None
 
 ocr_candidates = []
-ocr_overlay_ids = []
 ocr_selected_popup = None
 
 ziel_visible = False
@@ -177,6 +290,20 @@ target_is_custom = False
 
 last_winsPed_ok = False
 
+_db_conn = None
+_kennwort_map = None  # key.zip contents, read once
+_autofetch_after_id = None
+
+# one worker: the cached DB connection must not be used from two threads at once
+_db_pool = ThreadPoolExecutor(max_workers=1)
+DB_LOGIN_TIMEOUT = 10  # s
+DB_QUERY_TIMEOUT = 30  # s
+
+# (filiale, aufnr) -> (timestamp, rows); only touched on the Tk thread
+_winsPed_cache = OrderedDict()
+WINSPED_CACHE_SIZE = 256
+WINSPED_CACHE_TTL = 60.0
+
 
 # =========================== UTIL FUNCS ===============================
 
@@ -185,22 +312,26 @@ def safe_print(*args):
     print(txt.encode("ascii", "ignore").decode("ascii"))
 
 
+def post_to_tk(func, *args):
+    # for worker done-callbacks: run func on the Tk thread; dropped once the
+    # window is closed (root destroyed or mainloop already left)
+    try:
+        root.after(0, func, *args)
+    except (RuntimeError, tk.TclError):
+        pass
+
+
 def resource_path(rel_path: str) -> str:
     base = getattr(sys, "_MEIPASS", str(Path(__file__).resolve().parent))
     return str(Path(base) / rel_path)
 
 
 def extract_aufnr_from_filename(fname: str):
-    m = re.match(r"^(\d{8,9})", Path(fname).stem)
+    m = _AUFNR_RE.match(Path(fname).stem)
     return m.group(1) if m else None
 
 
-def rotate_before_save(img: Image.Image, angle: int):
-    if angle == 0:
-        return img
-    return img.rotate(-angle, expand=True)
-
-
+@functools.lru_cache(maxsize=8)
 def default_target_for_filiale(filiale: str) -> str:
     filiale = (filiale or "").strip()
     if filiale == "10":
@@ -213,69 +344,116 @@ def required_auf_len(filiale: str) -> int:
 
 
 def validate_aufnr(num: str, filiale: str):
+    need = required_auf_len(filiale)
+    # common case first: one length compare + isdigit, no message building
+    if len(num) == need and num.isdigit():
+        return True, ""
     if not num:
         return False, "Auftragsnummer fehlt."
     if not num.isdigit():
         return False, "Nur Ziffern erlaubt."
-    need = required_auf_len(filiale)
-    if len(num) != need:
-        return False, f"Filiale {filiale}: Auftragsnummer muss {need}-stellig sein."
-    return True, ""
+    return False, f"Filiale {filiale}: Auftragsnummer muss {need}-stellig sein."
 
 
 # ========================= CONFIG LOAD/SAVE ============================
 
+_config_cache = None  # parsed config.ini, read once per session
+
+
 def load_config():
-    cfg = configparser.ConfigParser()
-    if os.path.exists(CONFIG_FILE):
-        try:
-            cfg.read(CONFIG_FILE, encoding="utf-8")
-        except Exception as e:
-            safe_print("Config read failed:", e)
+    global _config_cache
+    if _config_cache is None:
+        cfg = configparser.ConfigParser()
+        if os.path.exists(CONFIG_FILE):
+            try:
+                cfg.read(CONFIG_FILE, encoding="utf-8")
+            except Exception as e:
+                safe_print("Config read failed:", e)
+
+        _config_cache = {
+            "source": cfg.get("paths", "source", fallback=DEFAULT_SOURCE),
+            "target": cfg.get("paths", "target", fallback=""),
+            "filiale": cfg.get("ui", "filiale", fallback="10"),
+            "doctype": cfg.get("ui", "doctype", fallback=DOC_TYPES[0]),
+        }
 
-    source = cfg.get("paths", "source", fallback=DEFAULT_SOURCE)
-    target = cfg.get("paths", "target", fallback="")
-    filiale = cfg.get("ui", "filiale", fallback="10")
-    doctype = cfg.get("ui", "doctype", fallback=DOC_TYPES[0])
-    return source, target, filiale, doctype
+    c = _config_cache
+    return c["source"], c["target"], c["filiale"], c["doctype"]
 
 
 def save_config():
-    cfg = configparser.ConfigParser()
-    cfg["paths"] = {
+    global _config_cache
+    values = {
         "source": entry_source.get().strip(),
         "target": entry_target.get().strip(),
-    }
-    cfg["ui"] = {
         "filiale": combo_filiale.get().strip(),
         "doctype": combo_doctype.get().strip(),
     }
-    with open(CONFIG_FILE, "w", encoding="utf-8") as f:
+    # nothing changed since load/last save -> closing needs no disk write
+    if values == _config_cache and os.path.exists(CONFIG_FILE):
+        return
+
+    cfg = configparser.ConfigParser()
+    cfg["paths"] = {
+        "source": values["source"],
+        "target": values["target"],
+    }
+    cfg["ui"] = {
+        "filiale": values["filiale"],
+        "doctype": values["doctype"],
+    }
+    # temp file + rename: a crash or AV stall never leaves a truncated config.ini
+    tmp = CONFIG_FILE + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
         cfg.write(f)
+    os.replace(tmp, CONFIG_FILE)
+    _config_cache = values
 
 
 # =========================== SQL / DB ===============================
 
-def kennwort(paramm):
-    value = ""
-    filename = r"\\srv-dc2\DATEN$\Wiki\DMS_NEW\key.zip"
+KEY_FILE = r"\\srv-dc2\DATEN$\Wiki\DMS_NEW\key.zip"
+_KEY_NAME_RE = re.compile(r"[^\s=:]+")
+
+
+def _load_kennwort_map():
+    # lines look like "<name> = <value>"; the value starts 3 chars after the name
+    global _kennwort_map
+    if _kennwort_map is not None:
+        return _kennwort_map
+
+    values = {}
     try:
-        with open(filename, "r", encoding="utf-8") as file:
+        with open(KEY_FILE, "r", encoding="utf-8") as file:
             for line in file:
                 line = line.strip()
-                if line.startswith(paramm):
-                    value = line[len(paramm) + 3:]
-                    break
+                m = _KEY_NAME_RE.match(line)
+                if m and m.group(0) not in values:
+                    values[m.group(0)] = line[m.end() + 3:]
     except Exception as e:
+        # not cached -> next connect retries the share
         safe_print("Key read error:", e)
-    return value
+        return {}
+
+    _kennwort_map = values
+    return values
+
+
+def kennwort(paramm):
+    return _load_kennwort_map().get(paramm, "")
 
 def fix_encoding(s):
-    if not isinstance(s, str):
+    # ASCII can't be mojibake; everything else is memoized
+    if not isinstance(s, str) or s.isascii():
         return s
+    return _fix_encoding_cached(s)
+
+
+@functools.lru_cache(maxsize=1024)
+def _fix_encoding_cached(s):
     try:
         return s.encode("latin1").decode("utf-8")
-    except Exception:
+    except UnicodeError:
         return s
 
 def get_db_connection():
@@ -285,7 +463,40 @@ def get_db_connection():
     db_name = kennwort("DefaultDatabase")
     if not server or not user or not password or not db_name:
         raise RuntimeError("DB credentials not found (key.zip).")
-    return pymssql.connect(server=server, user=user, password=password, database=db_name, charset="utf8")
+    # bounded: the interpreter waits for a running query before it exits
+    return pymssql.connect(server=server, user=user, password=password, database=db_name,
+                           charset="utf8", login_timeout=DB_LOGIN_TIMEOUT, timeout=DB_QUERY_TIMEOUT)
+
+
+def close_db_connection():
+    global _db_conn
+    if _db_conn is not None:
+        try:
+            _db_conn.close()
+        except Exception:
+            pass
+        _db_conn = None
+
+
+def _get_or_create_conn():
+    # reuse one connection; ping it and reconnect if the server dropped it
+    global _db_conn
+    if _db_conn is not None:
+        try:
+            cur = _db_conn.cursor()
+            cur.execute("SELECT 1")
+            cur.fetchall()
+            cur.close()
+            return _db_conn
+        except (pymssql.OperationalError, pymssql.InterfaceError) as e:
+            safe_print("DB connection lost, reconnecting:", e)
+            close_db_connection()
+
+    _db_conn = get_db_connection()
+    return _db_conn
+
+
+atexit.register(close_db_connection)
 
 
 # --- grouped WinSped panel fields (human friendly) ---
@@ -333,32 +544,71 @@ def safe_str(v):
     return "" if v is None else str(v)
 
 
-def update_winsPed_panel(row_dict, msg=""):
-    # status
-    lbl_db_status.config(text=msg)
+def set_panel_field(label, text):
+    # readonly Entry has to be switched to normal to change its text
+    if panel_values.get(label) == text:
+        return
+    panel_values[label] = text
+    e = panel_entries.get(label)
+    if e is not None:
+        e.configure(state="normal")
+        e.delete(0, tk.END)
+        e.insert(0, text)
+        e.configure(state="readonly")
 
-    # clear all fields
-    for key, var in panel_vars.items():
-        var.set("")
 
-    if not row_dict:
-        return
+def update_winsPed_panel(row_dict, msg="", busy=False):
+    # status; grayed while a query is running
+    lbl_db_status.config(text=msg, fg="#999" if busy else "#444")
 
-    # fill grouped fields
+    # fill grouped fields; columns not present in SQL -> empty
     for group_title, fields in PANEL_GROUPS:
         for label, col in fields:
-            if col in row_dict:
-                panel_vars[label].set(safe_str(row_dict[col]))
+            if row_dict and col in row_dict:
+                set_panel_field(label, safe_str(fix_encoding(row_dict[col])))
             else:
-                # column not present in SQL -> leave empty
-                panel_vars[label].set(fix_encoding(row_dict[col]))
+                set_panel_field(label, "")
+
+    panel_form.update_idletasks()
 
 
 def set_save_enabled(enabled: bool):
     btn_save.config(state=("normal" if enabled else "disabled"))
 
 
-def winsPed_query(aufnr: str):
+def _winsPed_fetch_rows(aufnr: str):
+    # runs in _db_pool, no Tk calls here
+    try:
+        cur = _get_or_create_conn().cursor(as_dict=True)
+        cur.execute(WINSPED_SQL, (aufnr,))
+        rows = cur.fetchall()
+        cur.close()
+    except Exception:
+        close_db_connection()
+        raise
+    return rows
+
+
+def _winsPed_cache_get(fil, aufnr):
+    now = time.monotonic()
+    for key in [k for k, (ts, _) in _winsPed_cache.items() if now - ts > WINSPED_CACHE_TTL]:
+        del _winsPed_cache[key]
+
+    hit = _winsPed_cache.get((fil, aufnr))
+    if hit is None:
+        return None
+    _winsPed_cache.move_to_end((fil, aufnr))
+    return hit[1]
+
+
+def _winsPed_cache_put(fil, aufnr, rows):
+    _winsPed_cache[(fil, aufnr)] = (time.monotonic(), rows)
+    _winsPed_cache.move_to_end((fil, aufnr))
+    while len(_winsPed_cache) > WINSPED_CACHE_SIZE:
+        _winsPed_cache.popitem(last=False)
+
+
+def winsPed_query(aufnr: str, force: bool = False):
     global last_winsPed_ok
 
     last_winsPed_ok = False
@@ -371,17 +621,39 @@ def winsPed_query(aufnr: str):
         update_winsPed_panel(None, msg=msg)
         return
 
+    rows = None if force else _winsPed_cache_get(fil, aufnr)
+    if rows is not None:
+        _show_winsPed_rows(rows)
+        return
+
+    update_winsPed_panel(None, msg="WinSped ...", busy=True)
+    fut = _db_pool.submit(_winsPed_fetch_rows, aufnr)
+    fut.add_done_callback(lambda f: post_to_tk(_apply_winsPed_result, aufnr, fil, f))
+
+
+def _apply_winsPed_result(aufnr, fil, fut):
     try:
-        conn = get_db_connection()
-        cur = conn.cursor(as_dict=True)
-        cur.execute(WINSPED_SQL, (aufnr,))
-        rows = cur.fetchall()
-        cur.close()
-        conn.close()
+        rows = fut.result()
     except Exception as e:
-        update_winsPed_panel(None, msg=f"DB error: {e}")
+        rows = None
+        err = e
+    else:
+        _winsPed_cache_put(fil, aufnr, rows)
+
+    # user already typed / navigated to another AUF -> drop stale result
+    if aufnr != entry_aufnr.get().strip() or fil != combo_filiale.get().strip():
+        return
+
+    if rows is None:
+        update_winsPed_panel(None, msg=f"DB error: {err}")
         return
 
+    _show_winsPed_rows(rows)
+
+
+def _show_winsPed_rows(rows):
+    global last_winsPed_ok
+
     if not rows:
         update_winsPed_panel(None, msg="No data found for AUF. Save is blocked.")
         return
@@ -408,26 +680,231 @@ def maybe_autofetch_winsPed(event=None):
         update_winsPed_panel(None, msg="AUF not complete.")
 
 
+AUTOFETCH_DELAY_MS = 300
+
+
+def schedule_autofetch_winsPed(event=None):
+    # coalesce a burst of keystrokes / paste into one WinSped lookup
+    global _autofetch_after_id, last_winsPed_ok
+    last_winsPed_ok = False
+    set_save_enabled(False)
+    if _autofetch_after_id is not None:
+        root.after_cancel(_autofetch_after_id)
+    _autofetch_after_id = root.after(AUTOFETCH_DELAY_MS, _do_autofetch)
+
+
+def _do_autofetch():
+    global _autofetch_after_id
+    _autofetch_after_id = None
+    maybe_autofetch_winsPed()
+
+
 # =========================== OCR HELPERS ===============================
 
-def ocr_candidates_from_crop(pil_crop: Image.Image, min_len: int) -> list[str]:
+OCR_CHAR_HEIGHT = 40  # px, glyph height Tesseract reads fastest
+OCR_MAX_CROP = 1200   # px, selections are downsampled to fit
+OCR_GLYPH_MIN_H = 3         # px, smaller ink components are speckle
+OCR_GLYPH_MAX_ASPECT = 8    # wider/taller than this many times the other side -> rule
+OCR_GLYPH_MIN_FILL = 0.1    # ink share of the bounding box; frames and grids are hollow
+OCR_MAX_SKEW = 10.0   # degrees; beyond that the selection is not a tilted text line
+OCR_SKEW_EST = 400    # px, angle is estimated on a copy this small
+OCR_MIN_CONF = 60     # Tesseract word confidence, 0..100
+OCR_PSM_BLOCK = 6     # selection crops
+OCR_PSM_LINE = 7      # selection crops holding one text line
+OCR_PSM_SPARSE = 11   # whole-page pass, numbers scattered over the page
+OCR_MERGE_GAP = 1.0      # max gap between word boxes to merge, in box heights
+OCR_MERGE_OVERLAP = 0.5  # min vertical overlap, fraction of the lower box
+
+
+def deskew_bw(bw):
+    # angle of the ink's minimum-area rectangle; OpenCV >= 4.5.1 reports (0, 90]
+    # estimated on a downscaled copy, only warpAffine sees the full crop
+    h, w = bw.shape
+    f = OCR_SKEW_EST / max(h, w)
+    if f < 1.0:
+        small = cv2.resize(bw, None, fx=f, fy=f, interpolation=cv2.INTER_AREA)
+        pts = cv2.findNonZero((small < 128).astype(np.uint8))
+    else:
+        pts = cv2.findNonZero(255 - bw)
+    if pts is None or len(pts) < 20:
+        return bw
+    angle = cv2.minAreaRect(pts)[2]
+    if angle > 45:
+        angle -= 90
+    elif angle < -45:
+        angle += 90
+    if abs(angle) < 0.5 or abs(angle) > OCR_MAX_SKEW:
+        return bw
+
+    m = cv2.getRotationMatrix2D((w / 2, h / 2), angle, 1.0)
+    return cv2.warpAffine(bw, m, (w, h), flags=cv2.INTER_NEAREST, borderValue=255)
+
+
+def prepare_ocr_image(pil_crop: Image.Image, deskew=False, max_scale=4.0):
+    # binarize (+ deskew) + scale text to OCR_CHAR_HEIGHT; without cv2 the crop goes as is
+    # -> (image for Tesseract, scale applied to pil_crop, text lines found or 0)
+    if cv2 is None:
+        return pil_crop, 1.0, 0
+
+    # PDF pages are rendered as "L" already; convert() would only copy them
+    gray = np.asarray(pil_crop if pil_crop.mode == "L" else pil_crop.convert("L"))
+    _, bw = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+    # straight lines first, the line count below relies on them
+    if deskew:
+        bw = deskew_bw(bw)
+
+    heights, lines = glyph_heights(bw)
+    if heights.size == 0:
+        return bw, 1.0, 0
+
+    scale = min(max_scale, max(0.25, OCR_CHAR_HEIGHT / float(np.median(heights))))
+    if abs(scale - 1.0) < 0.1:
+        return bw, 1.0, lines
+
+    interp = cv2.INTER_AREA if scale < 1.0 else cv2.INTER_CUBIC
+    return cv2.resize(bw, None, fx=scale, fy=scale, interpolation=interp), scale, lines
+
+
+def glyph_heights(bw):
+    # -> (heights of glyph-sized ink components, text lines they form)
+    # rules, frames and table grids are too flat, too thin or too hollow to count,
+    # speckle too small, so none of them can stretch or squash the text height
+    _n, _labels, stats, _c = cv2.connectedComponentsWithStats(255 - bw, connectivity=8)
+    _x, y, w, h, area = stats[1:].T
+    glyph = ((h >= OCR_GLYPH_MIN_H) & (w <= OCR_GLYPH_MAX_ASPECT * h)
+             & (h <= OCR_GLYPH_MAX_ASPECT * w) & (area >= OCR_GLYPH_MIN_FILL * w * h))
+    y, h = y[glyph], h[glyph]
+    if h.size == 0:
+        return h, 0
+
+    # text lines = runs of rows covered by a glyph
+    rows = np.zeros(bw.shape[0] + 1, dtype=np.int32)
+    np.add.at(rows, y, 1)
+    np.add.at(rows, y + h, -1)
+    ink = (np.cumsum(rows[:-1]) > 0).astype(np.int8)
+    edges = np.diff(np.concatenate(([0], ink, [0])))
+    return h, int(np.count_nonzero(edges == 1))
+
+
+def ocr_words(img, psm=OCR_PSM_BLOCK, engine="selection") -> list[tuple[str, float, tuple]]:
+    # (word, confidence 0..100, (x0, y0, x1, y1) in img pixels)
+    with _tess_locks[engine]:
+        api = get_tess_api(engine)
+        if api is not None:
+            api.SetPageSegMode(psm)
+            api.SetImage(img if isinstance(img, Image.Image) else Image.fromarray(img))
+            api.Recognize()
+            words = []
+            for r in iterate_level(api.GetIterator(), RIL.WORD):
+                w = r.GetUTF8Text(RIL.WORD)
+                if w and w.strip():
+                    words.append((w, float(r.Confidence(RIL.WORD)), r.BoundingBox(RIL.WORD)))
+            return words
+
     if pytesseract is None:
         raise RuntimeError("OCR not available (pytesseract/Tesseract not installed).")
 
-    txt = pytesseract.image_to_string(
-        pil_crop,
-        config="--psm 6 -c tessedit_char_whitelist=0123456789"
+    data = pytesseract.image_to_data(
+        img,
+        config=f"--oem 1 --psm {psm} -c tessedit_char_whitelist=0123456789",
+        output_type=pytesseract.Output.DICT,
     )
-    nums = re.findall(r"\d+", txt)
-    nums = [n for n in nums if len(n) >= min_len]
-
-    out, seen = [], set()
-    for n in nums:
-        if n not in seen:
-            seen.add(n)
-            out.append(n)
-
-    out.sort(key=len, reverse=True)
+    return [
+        (w, float(c), (x, y, x + bw, y + bh))
+        for w, c, x, y, bw, bh in zip(data["text"], data["conf"], data["left"],
+                                      data["top"], data["width"], data["height"])
+        if w.strip()
+    ]
+
+
+def merge_word_boxes(words, min_len: int, auf_len: int):
+    # Tesseract often splits one AUF number into 2-3 words: join neighbours on the
+    # same text line (vertical overlap, gap below OCR_MERGE_GAP box heights) in x order
+    # a join is kept only if it holds a fragment (< min_len) and has the AUF length,
+    # so a whole AUF next to another number never yields a longer bogus candidate
+    groups = []  # [x0, y0, x1, y1, [words], min conf]
+    for word, conf, (x0, y0, x1, y1) in sorted(words, key=lambda w: w[2][0]):
+        h = y1 - y0
+        for g in groups:
+            overlap = min(y1, g[3]) - max(y0, g[1])
+            if (overlap >= OCR_MERGE_OVERLAP * min(h, g[3] - g[1])
+                    and x0 - g[2] <= OCR_MERGE_GAP * max(h, g[3] - g[1])):
+                g[0], g[1] = min(g[0], x0), min(g[1], y0)
+                g[2], g[3] = max(g[2], x1), max(g[3], y1)
+                g[4].append(word)
+                g[5] = min(g[5], conf)
+                break
+        else:
+            groups.append([x0, y0, x1, y1, [word], conf])
+
+    return [
+        ("".join(g[4]), g[5], tuple(g[:4]))
+        for g in groups
+        if len(g[4]) > 1 and len("".join(g[4])) == auf_len
+        and min(len(w) for w in g[4]) < min_len
+    ]
+
+
+def candidates_from_words(words, min_len: int, auf_len: int) -> list[str]:
+    # number -> best confidence; low-confidence noise never reaches the popup
+    # single words stay candidates next to the merged ones
+    words = [w for w in words if w[1] >= OCR_MIN_CONF]
+    words += merge_word_boxes(words, min_len, auf_len)
+
+    best = {}
+    for word, conf, _box in words:
+        for n in _DIGITS_RE.findall(word):
+            if len(n) >= min_len and conf > best.get(n, -1.0):
+                best[n] = conf
+
+    return sorted(best, key=lambda n: (best[n], len(n)), reverse=True)
+
+
+def ocr_candidates_from_crop(pil_crop: Image.Image, min_len: int, auf_len: int) -> list[str]:
+    key = (hashlib.blake2b(pil_crop.tobytes(), digest_size=8).digest(),
+           pil_crop.size, min_len, auf_len)
+    with _crop_ocr_lock:
+        hit = _crop_ocr_cache.get(key)
+        if hit is not None:
+            _crop_ocr_cache.move_to_end(key)
+            return hit
+
+    candidates = _ocr_crop(pil_crop, min_len, auf_len)
+
+    with _crop_ocr_lock:
+        _crop_ocr_cache[key] = candidates
+        while len(_crop_ocr_cache) > CROP_OCR_CACHE_SIZE:
+            _crop_ocr_cache.popitem(last=False)
+    return candidates
+
+
+def _ocr_crop(pil_crop, min_len, auf_len):
+    if pil_crop.width > OCR_MAX_CROP or pil_crop.height > OCR_MAX_CROP:
+        pil_crop.thumbnail((OCR_MAX_CROP, OCR_MAX_CROP), Image.Resampling.BILINEAR)
+
+    # an AUF selection is usually one line -> line mode, cheaper than block layout
+    img, _scale, lines = prepare_ocr_image(pil_crop, deskew=True)
+    psm = OCR_PSM_LINE if lines == 1 else OCR_PSM_BLOCK
+    return candidates_from_words(ocr_words(img, psm=psm), min_len, auf_len)
+
+
+def ocr_page_words(full_img: Image.Image):
+    # whole page once, sparse-text mode; boxes mapped back to full_img pixels
+    # never upscaled: a whole page at 4x costs more than the selections it saves
+    img, scale, _lines = prepare_ocr_image(full_img, max_scale=1.0)
+    return [
+        (w, c, tuple(v / scale for v in box))
+        for w, c, box in ocr_words(img, psm=OCR_PSM_SPARSE, engine="page")
+    ]
+
+
+def words_in_box(words, left, top, right, bottom):
+    # words whose centre lies inside the selection (full_img pixels)
+    out = []
+    for w, c, (x0, y0, x1, y1) in words:
+        cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
+        if left <= cx <= right and top <= cy <= bottom:
+            out.append((w, c, (x0, y0, x1, y1)))
     return out
 
 
@@ -442,23 +919,28 @@ def close_candidate_popup():
 
 
 def clear_ocr_overlay():
-    for oid in ocr_overlay_ids:
-        try:
-            canvas_preview.delete(oid)
-        except:
-            pass
-    ocr_overlay_ids.clear()
+    canvas_preview.itemconfigure(ocr_rect_id, state="hidden")
+    canvas_preview.itemconfigure(ocr_text_id, state="hidden")
 
 
 def show_ocr_overlay(left, top, right, bottom, text=None, ok=True):
-    clear_ocr_overlay()
-    outline = "green" if ok else "red"
-    rid = canvas_preview.create_rectangle(left, top, right, bottom, outline=outline, width=3)
-    ocr_overlay_ids.append(rid)
+    # ok=None -> still running
+    outline = {True: "green", False: "red"}.get(ok, "orange")
+    canvas_preview.coords(ocr_rect_id, left, top, right, bottom)
+    canvas_preview.itemconfigure(ocr_rect_id, outline=outline, state="normal")
     if text:
-        tid = canvas_preview.create_text(left, max(0, top - 18), anchor="nw",
-                                         text=text, fill=outline, font=("Arial", 12, "bold"))
-        ocr_overlay_ids.append(tid)
+        canvas_preview.coords(ocr_text_id, left, max(0, top - 18))
+        canvas_preview.itemconfigure(ocr_text_id, text=text, fill=outline, state="normal")
+    else:
+        canvas_preview.itemconfigure(ocr_text_id, state="hidden")
+
+
+def clear_page_items():
+    # error text goes, the permanent page image/overlay items only empty/hide
+    canvas_preview.delete("page")
+    canvas_preview.itemconfigure(page_img_id, image="")
+    canvas_preview.itemconfigure(sel_rect_id, state="hidden")
+    clear_ocr_overlay()
 
 
 def choose_candidate_by_index(idx: int):
@@ -512,45 +994,356 @@ def show_candidate_popup():
 
 # =========================== RENDER PREVIEW ===========================
 
+@functools.lru_cache(maxsize=32)
+def _page_matrix(zoom, rotation):
+    # pages of one batch mostly share size -> same few matrices; never mutate the result
+    return fitz.Matrix(zoom, zoom).prerotate(rotation)
+
+
+def rasterize_pdf_page(path, page_index, rotation, zoom=None, as_pnm=False, shrink=1):
+    global _renders_since_shrink
+    # zoom=None -> just big enough for the preview box (/ shrink)
+    # PDFs in grayscale: preview and OCR need no colour, a third of the bytes
+    # MuPDF applies the rotation itself; as_pnm -> bytes for tk.PhotoImage, no PIL
+    with _fitz_lock:
+        if path == _current_doc_path and _current_doc is not None:
+            doc = _current_doc
+        else:
+            doc = fitz.open(path)
+        try:
+            page = doc.load_page(page_index)
+            if zoom is None:
+                w, h = page.rect.width, page.rect.height
+                if rotation in (90, 270):
+                    w, h = h, w
+                zoom = min(PREVIEW_MAX_W / w, PREVIEW_MAX_H / h, PDF_OCR_ZOOM) / shrink
+            pix = page.get_pixmap(matrix=_page_matrix(zoom, rotation),
+                                  colorspace=fitz.csGRAY, alpha=False)
+            if as_pnm:
+                out = pix.tobytes("pnm")
+            else:
+                # straight from the pixmap buffer, pix.samples would copy it to bytes first;
+                # frombytes, not frombuffer: an "L" image would keep pointing into pix
+                out = Image.frombytes("L", (pix.width, pix.height), pix.samples_mv,
+                                      "raw", "L", pix.stride)
+            pix = None
+            page = None
+        finally:
+            if doc is not _current_doc:
+                doc.close()
+        _renders_since_shrink += 1
+        if _renders_since_shrink >= STORE_SHRINK_EVERY:
+            fitz.TOOLS.store_shrink(50)
+            _renders_since_shrink = 0
+    return out
+
+
+def read_source_bytes(path):
+    # whole file read under _fitz_lock and decoded from memory: save/delete remove the
+    # source under the same lock, Windows refuses while any handle is open
+    with _fitz_lock:
+        with open(path, "rb") as f:
+            return io.BytesIO(f.read())
+
+
+def _render_page_images(path, page_index, rotation, is_pdf):
+    # runs in _render_pool, no Tk calls here
+    # -> (full image for OCR or None if rendered on demand, preview image or PGM bytes)
+    # None if the file was saved/deleted meanwhile (prefetch)
+    if not os.path.exists(path):
+        return None
+    if is_pdf:
+        return None, rasterize_pdf_page(path, page_index, rotation, as_pnm=True)
+
+    # image scans keep their colour (stamps, photos); OCR converts its crop to "L"
+    img = Image.open(read_source_bytes(path)).convert("RGB")
+    if rotation != 0:
+        img = img.rotate(-rotation, expand=True)
+
+    # one resample straight from the full image, no full-size copy
+    scale = min(PREVIEW_MAX_W / img.width, PREVIEW_MAX_H / img.height, 1.0)
+    if scale < 1.0:
+        size = (max(1, int(img.width * scale)), max(1, int(img.height * scale)))
+        preview = img.resize(size, Image.Resampling.BILINEAR)
+    else:
+        preview = img
+    return img, preview
+
+
+def _render_thumb(path, gen):
+    # runs in _thumb_pool, no Tk calls here -> (PNM bytes, zoom)
+    # PPM for images too: only tk.PhotoImage can zoom(), ImageTk.PhotoImage cannot
+    _page_idle.wait()
+    if gen != _thumb_gen or not os.path.exists(path):
+        return None
+    if path.lower().endswith(".pdf"):
+        return rasterize_pdf_page(path, 0, 0, as_pnm=True, shrink=THUMB_SHRINK), THUMB_SHRINK
+
+    box = (PREVIEW_MAX_W // THUMB_SHRINK, PREVIEW_MAX_H // THUMB_SHRINK)
+    with Image.open(read_source_bytes(path)) as im:
+        preview_w = im.width * min(PREVIEW_MAX_W / im.width, PREVIEW_MAX_H / im.height, 1.0)
+        # JPEG decodes straight at 1/2..1/8 size
+        im.draft("RGB", box)
+        thumb = im.convert("RGB")
+    thumb.thumbnail(box, Image.Resampling.BILINEAR)
+    buf = io.BytesIO()
+    thumb.save(buf, "PPM")
+    return buf.getvalue(), max(1, round(preview_w / thumb.width))
+
+
+def start_thumbnails():
+    global _thumb_gen
+    _thumb_gen += 1
+    _thumb_cache.clear()
+    _thumb_queued.clear()
+    queue_thumbnails()
+
+
+def queue_thumbnails():
+    # a window from the current file onwards, that is where the user browses next;
+    # next_file moves it along
+    gen = _thumb_gen
+    for path in files[current_index:current_index + THUMB_AHEAD]:
+        if path in _thumb_queued:
+            continue
+        _thumb_queued.add(path)
+        fut = _thumb_pool.submit(_render_thumb, path, gen)
+        fut.add_done_callback(lambda f, p=path: post_to_tk(_apply_thumb, p, gen, f))
+
+
+def _apply_thumb(path, gen, fut):
+    if gen != _thumb_gen or fut.cancelled():
+        return
+    try:
+        res = fut.result()
+    except Exception as e:
+        safe_print("thumbnail failed:", e)
+        return
+    if res is None:
+        return
+
+    thumb, zoom = res
+    tk_thumb = tk.PhotoImage(data=thumb)
+    _thumb_cache[path] = (tk_thumb, zoom)
+    _thumb_cache.move_to_end(path)
+    while len(_thumb_cache) > THUMB_CACHE_SIZE:
+        old, _ = _thumb_cache.popitem(last=False)
+        _thumb_queued.discard(old)
+
+    # real page still rendering -> better than the previous file
+    if _shown_key is None and _render_key == (path, 0, 0):
+        _show_thumb(tk_thumb, zoom)
+
+
+def _show_thumb(tk_thumb, zoom):
+    global _thumb_shown
+    _thumb_shown = tk_thumb.zoom(zoom) if zoom > 1 else tk_thumb
+    clear_page_items()
+    canvas_preview.configure(scrollregion=(0, 0, _thumb_shown.width(), _thumb_shown.height()))
+    canvas_preview.itemconfigure(page_img_id, image=_thumb_shown)
+
+
+def drop_page_cache(path=None):
+    if path is None:
+        _thumb_cache.clear()
+    else:
+        _thumb_cache.pop(path, None)
+    for cache in (_page_cache, _page_ocr_cache):
+        if path is None:
+            cache.clear()
+            continue
+        for key in [k for k in cache if k[0] == path]:
+            del cache[key]
+
+
+def _close_doc_locked():
+    # call with _fitz_lock held
+    global _current_doc, _current_doc_path
+    if _current_doc is not None:
+        try:
+            _current_doc.close()
+        except Exception:
+            pass
+    _current_doc = None
+    _current_doc_path = None
+    fitz.TOOLS.store_shrink(100)
+
+
+def close_current_doc():
+    # blocking: for save/delete/close, which must not leave the file open
+    global _doc_want
+    _doc_want = None
+    with _fitz_lock:
+        _close_doc_locked()
+
+
+def _sync_current_doc():
+    # runs in _render_pool: swap the open document for _doc_want
+    # -> (path, page count) or None if no PDF is wanted
+    global _current_doc, _current_doc_path
+    with _fitz_lock:
+        want = _doc_want
+        if _current_doc_path != want:
+            _close_doc_locked()
+            if want is not None:
+                _current_doc = fitz.open(want)
+                _current_doc_path = want
+        return None if want is None else (want, _current_doc.page_count)
+
+
+def open_current_doc(path):
+    # path None -> just close the previous PDF; page count arrives via _apply_page_count
+    global _doc_want, _doc_future
+    _doc_want = path
+    if _doc_future is not None:
+        _doc_future.cancel()
+    _doc_future = _render_pool.submit(_sync_current_doc)
+    _doc_future.add_done_callback(lambda f: post_to_tk(_apply_page_count, f))
+
+
+def _apply_page_count(fut):
+    global current_page_count
+    if fut.cancelled():
+        return
+    try:
+        res = fut.result()
+    except Exception as e:
+        # the page render reports it on the canvas
+        safe_print("PDF open failed:", e)
+        return
+    if res is not None and res[0] == current_file_path:
+        current_page_count = res[1]
+
+
+def clear_preview():
+    global current_full_img, _render_key, _shown_key
+    open_current_doc(None)
+    _render_key = None
+    _page_idle.set()
+    _shown_key = None
+    current_full_img = None
+    clear_page_items()
+
+
 def render_current_page():
-    global tk_img_preview, current_full_img, current_preview_scale
+    global current_full_img, _render_key, _shown_key
 
     if not current_file_path:
         return
 
+    key = (current_file_path, current_page_index, current_rotation)
+    _render_key = key
+    cancel_stale_renders(key)
+
+    hit = _page_cache.get(key)
+    if hit is not None:
+        _page_cache.move_to_end(key)
+        _show_page(key, *hit)
+        return
+
+    # no OCR on the old page while the new one renders
+    _shown_key = None
+    current_full_img = None
+    _page_idle.clear()
+    if key not in _render_pending:  # else a prefetch is already on it
+        _submit_render(key, current_is_pdf)
+
+    # submitted first: a broken thumbnail must not keep the page from rendering
+    thumb = _thumb_cache.get(key[0]) if key[1:] == (0, 0) else None
+    if thumb is not None:
+        _thumb_cache.move_to_end(key[0])
+        try:
+            _show_thumb(*thumb)
+        except tk.TclError as e:
+            safe_print("thumbnail failed:", e)
+
+
+def _submit_render(key, is_pdf):
+    fut = _render_pool.submit(_render_page_images, *key, is_pdf)
+    _render_pending[key] = fut
+    fut.add_done_callback(lambda f: post_to_tk(_apply_render, key, f))
+
+
+def cancel_stale_renders(keep):
+    # holding an arrow key must not queue a render for every page passed on the way;
+    # jobs already running finish and land in _page_cache
+    for key, fut in list(_render_pending.items()):
+        if key != keep and fut.cancel():
+            del _render_pending[key]
+
+
+def _prefetch(key):
+    # next page, or first page of the next file, while the user reads this one
+    if key != _shown_key:
+        return
+    path, page_index, rotation = key
+    if current_is_pdf and page_index + 1 < current_page_count:
+        nxt, is_pdf = (path, page_index + 1, rotation), True
+    elif current_index + 1 < len(files):
+        nxt_path = files[current_index + 1]
+        nxt, is_pdf = (nxt_path, 0, 0), nxt_path.lower().endswith(".pdf")
+    else:
+        return
+    if nxt not in _page_cache and nxt not in _render_pending:
+        _submit_render(nxt, is_pdf)
+
+
+def _apply_render(key, fut):
+    global current_full_img, _shown_key
+
+    if _render_pending.get(key) is fut:
+        del _render_pending[key]
+    if fut.cancelled():
+        return
     try:
-        if current_is_pdf:
-            doc = fitz.open(current_file_path)
-            page = doc.load_page(current_page_index)
-            pix = page.get_pixmap(matrix=fitz.Matrix(1.5, 1.5))
-            img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-            doc.close()
+        res = fut.result()
+        if res is None:
+            # saved/deleted meanwhile: fine for a prefetch, not for the shown page
+            error = f"Datei nicht gefunden:\n{key[0]}"
         else:
-            img = Image.open(current_file_path).convert("RGB")
+            img, preview = res
+            error = None
+    except Exception as e:
+        error = f"Fehler: {e}"
+    if error is not None:
+        if key == _render_key:
+            _page_idle.set()
+            clear_page_items()
+            canvas_preview.create_text(20, 20, anchor="nw", text=error, tags="page")
+            _shown_key = None
+            current_full_img = None
+        return
 
-        if current_rotation != 0:
-            img = img.rotate(-current_rotation, expand=True)
+    if isinstance(preview, bytes):
+        tk_img = tk.PhotoImage(data=preview)
+    else:
+        tk_img = ImageTk.PhotoImage(preview)
 
-        current_full_img = img
+    _page_cache[key] = (img, tk_img)
+    _page_cache.move_to_end(key)
+    while len(_page_cache) > PAGE_CACHE_SIZE:
+        _page_cache.popitem(last=False)
 
-        preview = img.copy()
-        preview.thumbnail((1100, 1400))
+    if key == _render_key:
+        _show_page(key, img, tk_img)
 
-        current_preview_scale = preview.width / img.width if img.width else 1.0
 
-        tk_img_preview = ImageTk.PhotoImage(preview)
+def _show_page(key, img, tk_img):
+    global tk_img_preview, current_full_img, _shown_key, _thumb_shown
 
-        canvas_preview.delete("all")
-        canvas_preview.config(width=preview.width, height=preview.height)
-        canvas_preview.create_image(0, 0, anchor="nw", image=tk_img_preview)
+    _shown_key = key
+    _thumb_shown = None
+    current_full_img = img
+    tk_img_preview = tk_img
+    _page_idle.set()
 
-        clear_ocr_overlay()
+    clear_page_items()
+    # scrollregion set once per page, no bbox("all") on every <Configure>
+    canvas_preview.configure(scrollregion=(0, 0, tk_img.width(), tk_img.height()))
+    canvas_preview.itemconfigure(page_img_id, image=tk_img_preview)
 
-    except Exception as e:
-        canvas_preview.delete("all")
-        canvas_preview.create_text(20, 20, anchor="nw", text=f"Fehler: {e}")
-        current_full_img = None
-        clear_ocr_overlay()
+    schedule_page_ocr(key)
+    root.after(PREFETCH_DELAY_MS, _prefetch, key)
 
 
 # =========================== LOAD FILES ===============================
@@ -562,7 +1355,7 @@ def load_current_file():
 
     if not files:
         label_filename.config(text="(keine Dateien)")
-        canvas_preview.delete("all")
+        clear_preview()
         return
 
     current_file_path = files[current_index]
@@ -573,17 +1366,14 @@ def load_current_file():
     ext = current_file_path.lower()
     current_is_pdf = ext.endswith(".pdf")
 
-    if current_is_pdf:
-        doc = fitz.open(current_file_path)
-        current_page_count = doc.page_count
-        doc.close()
-        current_page_index = 0
-    else:
-        current_page_count = 1
-        current_page_index = 0
+    # queued before the page render, so the count is in before the page shows
+    current_page_count = 1
+    current_page_index = 0
+    open_current_doc(current_file_path if current_is_pdf else None)
 
-    auf = extract_aufnr_from_filename(current_file_path)
-    if auf:
+    # same AUF as already entered -> WinSped state is still valid
+    auf = _file_aufnrs[current_index]
+    if auf and auf != entry_aufnr.get().strip():
         entry_aufnr.delete(0, tk.END)
         entry_aufnr.insert(0, auf)
         maybe_autofetch_winsPed()
@@ -591,25 +1381,39 @@ def load_current_file():
     render_current_page()
 
 
+def scan_source(src):
+    global _source_scan
+    mtime = os.stat(src).st_mtime
+    if _source_scan is not None and _source_scan[:2] == (src, mtime):
+        return list(_source_scan[2])
+
+    with os.scandir(src) as it:
+        found = sorted(
+            e.path for e in it
+            if e.is_file(follow_symlinks=False) and e.name.rpartition(".")[2].lower() in SOURCE_EXTS
+        )
+    _source_scan = (src, mtime, found)
+    return list(found)
+
+
 def load_files():
-    global files, current_index
+    global files, _file_aufnrs, current_index
     src = entry_source.get().strip()
     if not os.path.isdir(src):
         messagebox.showerror("Fehler", "Quelle existiert nicht.")
         return
 
-    files = sorted(
-        os.path.join(src, f)
-        for f in os.listdir(src)
-        if f.lower().endswith((".pdf", ".jpg", ".jpeg", ".png"))
-    )
+    files = scan_source(src)
+    _file_aufnrs = [extract_aufnr_from_filename(p) for p in files]
 
     if not files:
         messagebox.showinfo("Info", "Keine Dateien gefunden.")
         return
 
+    drop_page_cache()
     current_index = 0
     load_current_file()
+    start_thumbnails()
 
 
 # =========================== NAVIGATION ===============================
@@ -619,6 +1423,7 @@ def next_file(event=None):
     if current_index < len(files) - 1:
         current_index += 1
         load_current_file()
+        queue_thumbnails()
 
 
 def prev_file(event=None):
@@ -650,71 +1455,89 @@ def rotate_page():
 
 # =========================== MERGE PDF/JPG =============================
 
-def merge_pdfs(paths, out_pdf):
-    writer = PdfWriter()
-    for p in paths:
-        if os.path.exists(p):
-            try:
-                reader = PdfReader(p)
-                for page in reader.pages:
-                    writer.add_page(page)
-            except Exception as e:
-                safe_print("merge error:", e)
-
-    tmp = out_pdf + ".tmp"
-    with open(tmp, "wb") as f:
-        writer.write(f)
-    shutil.move(tmp, out_pdf)
-
-
-def append_image_to_pdf(image_path, final_pdf_path, dest_folder):
-    img = Image.open(image_path).convert("RGB")
-    if current_rotation != 0:
-        img = img.rotate(-current_rotation, expand=True)
-    temp_pdf = os.path.join(dest_folder, "__tmp_img.pdf")
-    img.save(temp_pdf, "PDF", resolution=300.0)
+def append_image_to_pdf(image_path, final_pdf_path):
+    # page size as if scanned at 300 dpi; JPEGs are embedded as they are (only the
+    # header is read), 8-bit PNG scans as JPEG - Flate of a photo/gray scan is ~10x
+    # bigger. Other modes (1, P, 16-bit I;16/I) go to MuPDF untouched, convert()
+    # would clip 16-bit grays to white
+    stream = None
+    with Image.open(image_path) as im:
+        width, height = im.size
+        if im.format == "PNG" and im.mode in ("L", "LA", "RGB", "RGBA"):
+            base = im.mode[0] if im.mode in ("L", "LA") else "RGB"
+            if im.mode in ("LA", "RGBA"):
+                flat = Image.new(base, im.size, "white")
+                flat.paste(im.convert(base), mask=im.getchannel("A"))
+            else:
+                flat = im
+            buf = io.BytesIO()
+            flat.save(buf, "JPEG", quality=PDF_JPEG_QUALITY, optimize=True)
+            stream = buf.getvalue()
+    rect = fitz.Rect(0, 0, width * 72 / 300, height * 72 / 300)
+
+    doc = fitz.open(final_pdf_path) if os.path.exists(final_pdf_path) else fitz.open()
+    tmp = None
+    try:
+        page = doc.new_page(width=rect.width, height=rect.height)
+        if stream is not None:
+            page.insert_image(rect, stream=stream)
+        else:
+            page.insert_image(rect, filename=image_path)
+        if current_rotation != 0:
+            page.set_rotation(current_rotation)
 
-    if os.path.exists(final_pdf_path):
-        merge_pdfs([final_pdf_path, temp_pdf], final_pdf_path)
-        os.remove(temp_pdf)
-    else:
-        shutil.move(temp_pdf, final_pdf_path)
+        # existing PDF: only the new page is appended to the file
+        if doc.name and doc.can_save_incrementally():
+            doc.save(final_pdf_path, incremental=True, deflate=True,
+                     encryption=fitz.PDF_ENCRYPT_KEEP)
+        else:
+            tmp = final_pdf_path + ".tmp"
+            doc.save(tmp, deflate=True)
+    finally:
+        doc.close()
+    if tmp:
+        shutil.move(tmp, final_pdf_path)
 
 
 def append_pdf_to_pdf(src_pdf, final_pdf):
-    if current_rotation == 0:
-        rotated = src_pdf
-    else:
-        rotated = final_pdf + ".rot.pdf"
-        doc = fitz.open(src_pdf)
-        out = fitz.open()
-
-        for i in range(doc.page_count):
-            page = doc.load_page(i)
-            pix = page.get_pixmap()
-            pil = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-            pil = rotate_before_save(pil, current_rotation)
-
-            tmp_page = rotated + f"_p{i}.pdf"
-            pil.save(tmp_page, "PDF", resolution=300)
-            out.insert_pdf(fitz.open(tmp_page))
-            os.remove(tmp_page)
-
-        out.save(rotated)
-        out.close()
-        doc.close()
+    src = fitz.open(src_pdf)
+    try:
+        # rotation goes into /Rotate of each page, no re-rasterizing
+        if current_rotation != 0:
+            for page in src:
+                page.set_rotation((page.rotation + current_rotation) % 360)
 
-    if os.path.exists(final_pdf):
-        merge_pdfs([final_pdf, rotated], final_pdf)
-    else:
-        shutil.move(rotated, final_pdf)
+        if not os.path.exists(final_pdf):
+            src.save(final_pdf)
+            return
 
-    if rotated.endswith(".rot.pdf") and os.path.exists(rotated):
-        os.remove(rotated)
+        dst = fitz.open(final_pdf)
+        tmp = None
+        try:
+            dst.insert_pdf(src)
+            if dst.can_save_incrementally():
+                dst.saveIncr()
+            else:
+                tmp = final_pdf + ".tmp"
+                dst.save(tmp)
+        finally:
+            dst.close()
+        if tmp:
+            shutil.move(tmp, final_pdf)
+    finally:
+        src.close()
 
 
 # ============================= LIS CREATION ===========================
 
+# ENDE record after the ref, the same for every document
+_LIS_ENDE_TAIL = (
+    "|0|0|0|0|0|0|0|0|0|0|0|0|0|0|0|0|0|0|0|0|0|0|0|0|0|0|0|0|0|0|0|0|"
+    "0|0|0|0|0|0|0|0|0|0|0|0|0|0|0|0|0|1|0|1|0|0|0|0|0|0|0|0|0|0|0|0|0|0|0|"
+    "0|0|0|0|0|0|0|0|0|"
+)
+
+
 def create_lis(aufnr, doctype, pdf_filename_only, folder):
     os.makedirs(folder, exist_ok=True)
 
@@ -724,23 +1547,39 @@ def create_lis(aufnr, doctype, pdf_filename_only, folder):
     lis_name = pdf_filename_only.replace(".pdf", ".txt")
     lis_path = os.path.join(folder, lis_name)
 
-    ENDE_LINE = (
-        f"ENDE|{ref}|0|0|0|0|0|0|0|0|0|0|0|0|0|0|0|0|0|0|0|0|0|0|0|0|0|0|0|0|0|0|0|0|"
-        "0|0|0|0|0|0|0|0|0|0|0|0|0|0|0|0|0|1|0|1|0|0|0|0|0|0|0|0|0|0|0|0|0|0|0|"
-        "0|0|0|0|0|0|0|0|0|"
-    )
-
-    with open(lis_path, "w", encoding="latin-1", errors="replace") as f:
-        f.write(f"START|{ref}|{today}|||GetMyInvoices|||Carstensen||||||||||||\n")
-        f.write(f"DMSDOK|{ref}|1|WINSPED|#JJJJ#|{doctype}|{pdf_filename_only}||\n")
-        f.write(f"DMSSW|{ref}|1|1|AUFNR|{aufnr}|\n")
-        f.write(ENDE_LINE + "\n")
+    # os.linesep: same CRLF endings the former text-mode writes produced on Windows
+    payload = os.linesep.join([
+        f"START|{ref}|{today}|||GetMyInvoices|||Carstensen||||||||||||",
+        f"DMSDOK|{ref}|1|WINSPED|#JJJJ#|{doctype}|{pdf_filename_only}||",
+        f"DMSSW|{ref}|1|1|AUFNR|{aufnr}|",
+        "ENDE|" + ref + _LIS_ENDE_TAIL,
+    ]) + os.linesep
+    data = payload.encode("latin-1", "replace")
+
+    # one write + atomic rename: the DMS import never sees a half-written LIS
+    tmp = lis_path + ".tmp"
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o644)
+    try:
+        os.write(fd, data)
+    finally:
+        os.close(fd)
+    os.replace(tmp, lis_path)
 
     return lis_path
 
 
 # ============================= SAVE FILE ===============================
 
+def release_current_file():
+    # no worker may start on the current file any more, then let go of it;
+    # caller removes/moves it while holding _fitz_lock
+    global _shown_key, _render_key
+    _shown_key = None
+    _render_key = None
+    _page_idle.set()
+    close_current_doc()
+
+
 def save_file(event=None):
     global current_file_path
 
@@ -767,25 +1606,41 @@ def save_file(event=None):
     final_pdf = os.path.join(dest_folder, f"{aufnr}_{doctype}.pdf")
     pdf_name_only = os.path.basename(final_pdf)
 
+    lis_name_only = pdf_name_only.replace(".pdf", ".txt")
+    lis_path = os.path.join(dest_folder, lis_name_only)
+
+    # Windows cannot move/delete a file MuPDF still holds open; append and remove
+    # under one lock hold, so no render/OCR/thumbnail worker opens it in between
+    # the source goes only once PDF and LIS are both written
+    release_current_file()
+    delete_error = None
     try:
-        if current_file_path.lower().endswith(".pdf"):
-            append_pdf_to_pdf(current_file_path, final_pdf)
-        else:
-            append_image_to_pdf(current_file_path, final_pdf, dest_folder)
+        with _fitz_lock:
+            if current_file_path.lower().endswith(".pdf"):
+                append_pdf_to_pdf(current_file_path, final_pdf)
+            else:
+                append_image_to_pdf(current_file_path, final_pdf)
+            if not os.path.exists(lis_path):
+                create_lis(aufnr, doctype, pdf_name_only, dest_folder)
+            try:
+                os.remove(current_file_path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                delete_error = e
     except Exception as e:
         messagebox.showerror("Fehler", f"SAVE ERROR:\n{e}")
+        render_current_page()
         return
 
-    lis_name_only = pdf_name_only.replace(".pdf", ".txt")
-    lis_path = os.path.join(dest_folder, lis_name_only)
-    if not os.path.exists(lis_path):
-        create_lis(aufnr, doctype, pdf_name_only, dest_folder)
-
-    if os.path.exists(current_file_path):
-        try:
-            os.remove(current_file_path)
-        except Exception as e:
-            safe_print("Delete failed:", current_file_path, e)
+    drop_page_cache(current_file_path)
+    if delete_error is not None:
+        # still in the source folder -> the next Load would append it a second time
+        messagebox.showerror(
+            "Fehler",
+            f"Gespeichert, aber Quelldatei konnte nicht gelöscht werden:\n"
+            f"{current_file_path}\n{delete_error}\n\nBitte manuell löschen.",
+        )
 
     next_file()
 
@@ -800,17 +1655,22 @@ def delete_file(event=None):
     if not messagebox.askyesno("Delete", f"Datei löschen?\n{current_file_path}"):
         return
 
+    release_current_file()
     try:
-        os.remove(current_file_path)
+        with _fitz_lock:
+            os.remove(current_file_path)
     except Exception as e:
         messagebox.showerror("Fehler", str(e))
+        load_current_file()
         return
 
+    drop_page_cache(current_file_path)
     del files[current_index]
+    del _file_aufnrs[current_index]
 
     if not files:
         label_filename.config(text="")
-        canvas_preview.delete("all")
+        clear_preview()
         entry_aufnr.delete(0, tk.END)
         set_save_enabled(False)
         update_winsPed_panel(None, msg="")
@@ -824,37 +1684,119 @@ def delete_file(event=None):
 
 # =========================== MOUSE SELECTION / OCR ===========================
 
+def canvas_point(event):
+    # window -> canvas coordinates (the canvas is scrolled)
+    return canvas_preview.canvasx(event.x), canvas_preview.canvasy(event.y)
+
+
 def on_sel_start(event):
-    global sel_start, sel_rect_id
-    sel_start = (event.x, event.y)
+    global sel_start
+    sel_start = canvas_point(event)
     close_candidate_popup()
     clear_ocr_overlay()
-    if sel_rect_id is not None:
-        canvas_preview.delete(sel_rect_id)
-        sel_rect_id = None
+    canvas_preview.coords(sel_rect_id, *sel_start, *sel_start)
+    canvas_preview.itemconfigure(sel_rect_id, state="normal")
 
 
 def on_sel_move(event):
-    global sel_rect_id
+    # motion events only record the position; one redraw per idle pass
+    global _pending_motion
     if sel_start is None:
         return
-    x0, y0 = sel_start
-    x1, y1 = event.x, event.y
-    if sel_rect_id is not None:
-        canvas_preview.coords(sel_rect_id, x0, y0, x1, y1)
-    else:
-        sel_rect_id = canvas_preview.create_rectangle(x0, y0, x1, y1, outline="red", width=2)
+    scheduled = _pending_motion is not None
+    _pending_motion = canvas_point(event)
+    if not scheduled:
+        root.after_idle(_flush_motion)
+
+
+def _flush_motion():
+    global _pending_motion
+    pos, _pending_motion = _pending_motion, None
+    if pos is None or sel_start is None:
+        return
+    canvas_preview.coords(sel_rect_id, *sel_start, *pos)
+
+
+def _ocr_job(key, full_img, preview_w, box, min_len, auf_len):
+    # runs in _ocr_pool, no Tk calls here
+    # PDF pages get their OCR raster only now, the preview is rendered smaller
+    if full_img is None:
+        if not os.path.exists(key[0]):
+            raise FileNotFoundError(key[0])
+        full_img = rasterize_pdf_page(*key, zoom=PDF_OCR_ZOOM)
+
+    scale = preview_w / full_img.width if full_img.width else 1.0
+    left, top, right, bottom = box
+    L = int(left / scale)
+    T = int(top / scale)
+    R = int(right / scale)
+    B = int(bottom / scale)
+
+    L = max(0, min(L, full_img.width - 1))
+    T = max(0, min(T, full_img.height - 1))
+    R = max(1, min(R, full_img.width))
+    B = max(1, min(B, full_img.height))
+
+    crop = full_img.crop((L, T, R, B))
+    return full_img, ocr_candidates_from_crop(crop, min_len=min_len, auf_len=auf_len)
+
+
+def schedule_page_ocr(key):
+    if PyTessBaseAPI is None and pytesseract is None:
+        return
+    root.after(PAGE_OCR_DELAY_MS, _start_page_ocr, key)
+
+
+def _start_page_ocr(key):
+    # only for pages the user stays on
+    if key != _shown_key or key in _page_ocr_cache or key in _page_ocr_pending:
+        return
+    _page_ocr_pending.add(key)
+    fut = _page_ocr_pool.submit(_page_ocr_job, key, current_full_img)
+    fut.add_done_callback(lambda f: post_to_tk(_apply_page_ocr, key, f))
+
+
+def _page_ocr_job(key, full_img):
+    # runs in _page_ocr_pool, no Tk calls here; the user may have moved on meanwhile
+    if key != _shown_key or not os.path.exists(key[0]):
+        return None
+    if full_img is None:
+        full_img = rasterize_pdf_page(*key, zoom=PDF_OCR_ZOOM)
+    return full_img, ocr_page_words(full_img)
+
+
+def _apply_page_ocr(key, fut):
+    global current_full_img
+
+    _page_ocr_pending.discard(key)
+    try:
+        res = fut.result()
+    except Exception as e:
+        safe_print("page OCR failed:", e)
+        return
+    if res is None:
+        return
+
+    full_img, words = res
+
+    if key == _shown_key and current_full_img is None:
+        current_full_img = full_img
+
+    _page_ocr_cache[key] = (full_img.size, words)
+    _page_ocr_cache.move_to_end(key)
+    while len(_page_ocr_cache) > PAGE_OCR_CACHE_SIZE:
+        _page_ocr_cache.popitem(last=False)
 
 
 def on_sel_end(event):
-    global sel_start, ocr_candidates
+    global sel_start, _ocr_seq
 
-    if sel_start is None or current_full_img is None:
+    if sel_start is None or _shown_key is None:
         sel_start = None
         return
 
     x0, y0 = sel_start
-    x1, y1 = event.x, event.y
+    x1, y1 = canvas_point(event)
     sel_start = None
 
     left = min(x0, x1)
@@ -865,36 +1807,63 @@ def on_sel_end(event):
     if (right - left) < 10 or (bottom - top) < 10:
         return
 
-    scale = current_preview_scale if current_preview_scale > 0 else 1.0
-    L = int(left / scale)
-    T = int(top / scale)
-    R = int(right / scale)
-    B = int(bottom / scale)
-
-    L = max(0, min(L, current_full_img.width - 1))
-    T = max(0, min(T, current_full_img.height - 1))
-    R = max(1, min(R, current_full_img.width))
-    B = max(1, min(B, current_full_img.height))
-
-    crop = current_full_img.crop((L, T, R, B))
-
     fil = combo_filiale.get().strip()
     need = required_auf_len(fil)
     min_len = max(6, need)
 
+    box = (left, top, right, bottom)
+    key = _shown_key
+    _ocr_seq += 1
+    seq = _ocr_seq
+
+    # page already OCR'd in the background -> just filter its word boxes
+    hit = _page_ocr_cache.get(key)
+    if hit is not None:
+        full_size, words = hit
+        scale = tk_img_preview.width() / full_size[0]
+        candidates = candidates_from_words(words_in_box(words, *(v / scale for v in box)),
+                                           min_len, need)
+        if candidates:
+            show_ocr_result(box, candidates)
+            return
+
+    show_ocr_overlay(*box, text="OCR ...", ok=None)
+    fut = _ocr_pool.submit(_ocr_job, key, current_full_img, tk_img_preview.width(), box,
+                           min_len, need)
+    fut.add_done_callback(lambda f: post_to_tk(_apply_ocr, seq, key, box, f))
+
+
+def _apply_ocr(seq, key, box, fut):
+    global current_full_img
+
     try:
-        ocr_candidates = ocr_candidates_from_crop(crop, min_len=min_len)
+        full_img, candidates = fut.result()
     except Exception as e:
-        show_ocr_overlay(left, top, right, bottom, text="OCR error", ok=False)
-        messagebox.showerror("Fehler", f"OCR error:\n{e}")
+        if seq == _ocr_seq and key == _shown_key:
+            show_ocr_overlay(*box, text="OCR error", ok=False)
+            messagebox.showerror("Fehler", f"OCR error:\n{e}")
         return
 
+    # keep the OCR raster for further selections on the same page
+    if key == _shown_key and current_full_img is None:
+        current_full_img = full_img
+
+    if seq != _ocr_seq or key != _shown_key:
+        return
+
+    show_ocr_result(box, candidates)
+
+
+def show_ocr_result(box, candidates):
+    global ocr_candidates
+
+    ocr_candidates = candidates
     if not ocr_candidates:
-        show_ocr_overlay(left, top, right, bottom, text="No number", ok=False)
+        show_ocr_overlay(*box, text="No number", ok=False)
         messagebox.showerror("Fehler", "OCR: keine Nummer erkannt.")
         return
 
-    show_ocr_overlay(left, top, right, bottom, text=f"Found: {len(ocr_candidates)}", ok=True)
+    show_ocr_overlay(*box, text=f"Found: {len(ocr_candidates)}", ok=True)
 
     if len(ocr_candidates) == 1:
         choose_candidate_by_index(0)
@@ -1006,7 +1975,7 @@ frame_info.pack()
 tk.Label(frame_info, text="Auftragsnummer:", bg="#f2f2f2").grid(row=0, column=0)
 entry_aufnr = ttk.Entry(frame_info, width=20)
 entry_aufnr.grid(row=0, column=1, padx=5)
-entry_aufnr.bind("<KeyRelease>", maybe_autofetch_winsPed)
+entry_aufnr.bind("<KeyRelease>", schedule_autofetch_winsPed)
 
 tk.Label(frame_info, text="Dokumenttyp:", bg="#f2f2f2").grid(row=0, column=2, padx=(20, 5))
 combo_doctype = ttk.Combobox(frame_info, values=DOC_TYPES, width=30, state="readonly")
@@ -1032,7 +2001,7 @@ def on_filiale_change(event=None):
         entry_target.delete(0, tk.END)
         entry_target.insert(0, default_target_for_filiale(fil))
 
-    maybe_autofetch_winsPed()
+    schedule_autofetch_winsPed()
 
 combo_filiale.bind("<<ComboboxSelected>>", on_filiale_change)
 
@@ -1041,20 +2010,23 @@ combo_filiale.bind("<<ComboboxSelected>>", on_filiale_change)
 frame_btn = tk.Frame(root, bg="#f2f2f2")
 frame_btn.pack(pady=10)
 
-ttk.Button(frame_btn, text="Load", width=12, command=load_files).grid(row=0, column=0, padx=4)
-ttk.Button(frame_btn, text="↑ Page", width=12, command=prev_page).grid(row=0, column=1, padx=4)
-ttk.Button(frame_btn, text="↓ Page", width=12, command=next_page).grid(row=0, column=2, padx=4)
-ttk.Button(frame_btn, text="Rotate ↻", width=12, command=rotate_page).grid(row=0, column=3, padx=4)
-ttk.Button(frame_btn, text="<< Prev", width=12, command=prev_file).grid(row=0, column=4, padx=4)
-ttk.Button(frame_btn, text="Next >>", width=12, command=next_file).grid(row=0, column=5, padx=4)
+# one style for the whole toolbar instead of per-button options
+ttk.Style().configure("Toolbar.TButton", width=12)
 
-btn_save = ttk.Button(frame_btn, text="Save", width=12, command=save_file)
+ttk.Button(frame_btn, text="Load", style="Toolbar.TButton", command=load_files).grid(row=0, column=0, padx=4)
+ttk.Button(frame_btn, text="↑ Page", style="Toolbar.TButton", command=prev_page).grid(row=0, column=1, padx=4)
+ttk.Button(frame_btn, text="↓ Page", style="Toolbar.TButton", command=next_page).grid(row=0, column=2, padx=4)
+ttk.Button(frame_btn, text="Rotate ↻", style="Toolbar.TButton", command=rotate_page).grid(row=0, column=3, padx=4)
+ttk.Button(frame_btn, text="<< Prev", style="Toolbar.TButton", command=prev_file).grid(row=0, column=4, padx=4)
+ttk.Button(frame_btn, text="Next >>", style="Toolbar.TButton", command=next_file).grid(row=0, column=5, padx=4)
+
+btn_save = ttk.Button(frame_btn, text="Save", style="Toolbar.TButton", command=save_file)
 btn_save.grid(row=0, column=6, padx=4)
 
-ttk.Button(frame_btn, text="Delete", width=12, command=delete_file).grid(row=0, column=7, padx=4)
-ttk.Button(frame_btn, text="Hilfe (F1)", width=12, command=show_help).grid(row=0, column=8, padx=4)
-ttk.Button(frame_btn, text="WinSped (F5)", width=12,
-           command=lambda: winsPed_query(entry_aufnr.get().strip())
+ttk.Button(frame_btn, text="Delete", style="Toolbar.TButton", command=delete_file).grid(row=0, column=7, padx=4)
+ttk.Button(frame_btn, text="Hilfe (F1)", style="Toolbar.TButton", command=show_help).grid(row=0, column=8, padx=4)
+ttk.Button(frame_btn, text="WinSped (F5)", style="Toolbar.TButton",
+           command=lambda: winsPed_query(entry_aufnr.get().strip(), force=True)
 ).grid(row=0, column=9, padx=4)
 
 set_save_enabled(False)
@@ -1067,33 +2039,36 @@ label_filename.pack(pady=5)
 preview_frame = tk.Frame(root, bg="#f2f2f2")
 preview_frame.pack(fill="both", expand=True)
 
-# left with scrolling container
+# left: preview canvas (image + OCR selection), scrolls itself
 left_frame = tk.Frame(preview_frame, bg="#f2f2f2")
 left_frame.pack(side="left", fill="both", expand=True)
 
-scroll_canvas = tk.Canvas(left_frame, bg="white")
-scroll_canvas.pack(side="left", fill="both", expand=True)
+canvas_preview = tk.Canvas(left_frame, bg="white", highlightthickness=0)
+canvas_preview.pack(side="left", fill="both", expand=True)
 
-scroll_y = ttk.Scrollbar(left_frame, orient="vertical", command=scroll_canvas.yview)
+scroll_y = ttk.Scrollbar(left_frame, orient="vertical", command=canvas_preview.yview)
 scroll_y.pack(side="right", fill="y")
-scroll_canvas.configure(yscrollcommand=scroll_y.set)
-
-inner = tk.Frame(scroll_canvas, bg="white")
-scroll_canvas.create_window((0, 0), window=inner, anchor="nw")
+canvas_preview.configure(yscrollcommand=scroll_y.set)
 
-def update_scroll(event=None):
-    scroll_canvas.configure(scrollregion=scroll_canvas.bbox("all"))
-
-inner.bind("<Configure>", update_scroll)
-
-# actual preview canvas (for image + OCR selection)
-canvas_preview = tk.Canvas(inner, bg="white", highlightthickness=0)
-canvas_preview.pack(padx=10, pady=10)
+# created first -> stays below the overlay items
+page_img_id = canvas_preview.create_image(0, 0, anchor="nw")
+sel_rect_id = canvas_preview.create_rectangle(0, 0, 0, 0, outline="red", width=2, state="hidden")
+ocr_rect_id = canvas_preview.create_rectangle(0, 0, 0, 0, width=3, state="hidden")
+ocr_text_id = canvas_preview.create_text(0, 0, anchor="nw", font=("Arial", 12, "bold"),
+                                         state="hidden")
 
 canvas_preview.bind("<ButtonPress-1>", on_sel_start)
 canvas_preview.bind("<B1-Motion>", on_sel_move)
 canvas_preview.bind("<ButtonRelease-1>", on_sel_end)
 
+
+def _on_wheel(event):
+    # touchpads send deltas below one notch (120), still scroll one unit
+    canvas_preview.yview_scroll(-1 if event.delta > 0 else 1, "units")
+
+
+canvas_preview.bind("<MouseWheel>", _on_wheel)
+
 # right: DB info panel
 right_frame = tk.Frame(preview_frame, bg="#f7f7f7", width=420)
 right_frame.pack(side="right", fill="y")
@@ -1104,36 +2079,60 @@ tk.Label(right_frame, text=" WinSped ", bg="#f7f7f7",
 lbl_db_status = tk.Label(right_frame, text="", bg="#f7f7f7", fg="#444")
 lbl_db_status.pack(pady=(0, 10))
 
-panel_vars = {}
+panel_values = {}   # label -> text, also for fields not built yet
+panel_entries = {}  # label -> readonly Entry of expanded groups
 panel_form = tk.Frame(right_frame, bg="#f7f7f7")
 panel_form.pack(fill="y", padx=10)
 
-row_i = 0
-
-for group_title, fields in PANEL_GROUPS:
-    # group header
-    hdr = tk.Label(
-        panel_form,
-        text=group_title,
-        bg="#f7f7f7",
-        anchor="w",
-        font=("Arial", 10, "bold")
-    )
-    hdr.grid(row=row_i, column=0, columnspan=2, sticky="w", pady=(10, 4))
-    row_i += 1
+# group title -> body frame, built on first expand
+panel_bodies = {}
+panel_headers = {}
+
+
+def _build_panel_body(fields):
+    body = tk.Frame(panel_form, bg="#f7f7f7")
+    for r, (label, col) in enumerate(fields):
+        tk.Label(body, text=label + ":", bg="#f7f7f7", anchor="w", width=20) \
+            .grid(row=r, column=0, sticky="w", pady=2)
+
+        e = ttk.Entry(body, width=42)
+        e.insert(0, panel_values.get(label, ""))
+        e.configure(state="readonly")
+        e.grid(row=r, column=1, sticky="w", pady=2)
+        panel_entries[label] = e
+    return body
+
+
+def toggle_panel_group(group_index):
+    group_title, fields = PANEL_GROUPS[group_index]
+    body = panel_bodies.get(group_title)
+
+    if body is None:
+        body = _build_panel_body(fields)
+        body.grid(row=2 * group_index + 1, column=0, sticky="w")
+        panel_bodies[group_title] = body
+        expanded = True
+    elif body.grid_info():
+        body.grid_remove()
+        expanded = False
+    else:
+        body.grid()
+        expanded = True
 
-    # group fields
-    for label, col in fields:
-        tk.Label(panel_form, text=label + ":", bg="#f7f7f7", anchor="w") \
-            .grid(row=row_i, column=0, sticky="w", pady=2)
+    panel_headers[group_title].config(text=("▾ " if expanded else "▸ ") + group_title)
 
-        v = tk.StringVar()
-        panel_vars[label] = v
 
-        e = ttk.Entry(panel_form, textvariable=v, width=42, state="readonly")
-        e.grid(row=row_i, column=1, sticky="w", pady=2)
+for group_index, (group_title, fields) in enumerate(PANEL_GROUPS):
+    hdr = ttk.Button(
+        panel_form,
+        text="▸ " + group_title,
+        command=lambda i=group_index: toggle_panel_group(i)
+    )
+    hdr.grid(row=2 * group_index, column=0, sticky="ew", pady=(10, 4))
+    panel_headers[group_title] = hdr
 
-        row_i += 1
+# first group open, the rest on demand
+toggle_panel_group(0)
 
 
 # ---------- Toggle ONLY Ziel row (Alt+N) ----------
@@ -1145,8 +2144,9 @@ def toggle_ziel_visibility(event=None):
     else:
         frame_dst.grid_remove()
 
-root.bind_all("<Alt-n>", toggle_ziel_visibility)
-root.bind_all("<Alt-N>", toggle_ziel_visibility)
+# window-level, like the other hotkeys; <Alt-N> stays for Shift/CapsLock
+root.bind("<Alt-n>", toggle_ziel_visibility)
+root.bind("<Alt-N>", toggle_ziel_visibility)
 
 
 # ---------- HOTKEYS ----------
@@ -1157,7 +2157,7 @@ root.bind("<Right>", next_file)
 root.bind("<Up>", prev_page)
 root.bind("<Down>", next_page)
 root.bind("<F1>", show_help)
-root.bind("<F5>", lambda e: winsPed_query(entry_aufnr.get().strip()))
+root.bind("<F5>", lambda e: winsPed_query(entry_aufnr.get().strip(), force=True))
 
 
 # ---------- LOAD CONFIG ----------
@@ -1190,6 +2190,11 @@ def on_close():
         save_config()
     except Exception as e:
         safe_print("Config save failed:", e)
+    # queued jobs are dropped; running ones finish and their results are discarded
+    _page_idle.set()
+    for pool in (_db_pool, _render_pool, _thumb_pool, _ocr_pool, _page_ocr_pool):
+        pool.shutdown(wait=False, cancel_futures=True)
+    close_current_doc()
     root.destroy()
 
 root.protocol("WM_DELETE_WINDOW", on_close)